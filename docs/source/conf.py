@@ -73,63 +73,83 @@ intersphinx_mapping = {
 }
 html_logo = "https://github.com/sbalk/ViperBoxInterface/blob/main/imgs/viperboxinterface.png?raw=true"
 
+# Regex to match markdown headers (e.g., ## Header)
+HEADER_RE = re.compile(r"^(#+)\s+(.+)$", re.MULTILINE)
+
+# Mapping of markdown alert markers to their admonition names
+ALERT_ADMONITIONS = {
+    "IMPORTANT": "important",
+    "NOTE": "note",
+    "TIP": "tip",
+    "WARNING": "caution",
+}
+_ALERT_HEADER = r"[^\S\n]*> \[!({})\]".format("|".join(ALERT_ADMONITIONS))
+# Regex to match a markdown alert: the header line and the '>' lines that follow it,
+# a line with the header of another alert starts a new match
+ALERT_RE = re.compile(
+    rf"^{_ALERT_HEADER}.*(?:\n|\Z)"
+    rf"(?P<body>(?:(?!{_ALERT_HEADER})[^\S\n]*>.*(?:\n|\Z))*)",
+    re.MULTILINE,
+)
+
+# Replacements that turn relative `./imgs/` links into absolute links to GitHub
+_IMAGE_LINK_REPLACEMENTS = {
+    "(./imgs/": "(https://raw.githubusercontent.com/sbalk/ViperBoxInterface/main/imgs/",
+    ".png)": ".png?raw=true)",
+    ".gif)": ".gif?raw=true)",
+}
+IMAGE_LINK_RE = re.compile("|".join(map(re.escape, _IMAGE_LINK_REPLACEMENTS)))
+
+# Named emojis that end up in the anchors of the README headers
+_ANCHOR_EMOJIS = [
+    "brain",
+    "books",
+    "desktop_computer",
+    "gear",
+    "question",
+    "robot",
+    "hammer_and_wrench",
+]
+EMOJI_ANCHOR_RE = re.compile("#({})-".format("|".join(_ANCHOR_EMOJIS)))
 
-def replace_named_emojis(input_file: Path, output_file: Path) -> None:
-    """Replace named emojis in a file with unicode emojis."""
+
+def _replace_named_emojis(content: str) -> str:
     import emoji
 
+    return emoji.emojize(content, language="alias")
+
+
+def replace_named_emojis(input_file: Path, output_file: Path) -> None:
+    """Replace named emojis in a file with unicode emojis."""
     with input_file.open("r") as infile:
         content = infile.read()
-    content_with_emojis = emoji.emojize(content, language="alias")
+    content_with_emojis = _replace_named_emojis(content)
 
     with output_file.open("w") as outfile:
         outfile.write(content_with_emojis)
 
 
-def _change_alerts_to_admonitions(input_text: str) -> str:
-    # Splitting the text into lines
-    lines = input_text.split("\n")
-
-    # Placeholder for the edited text
-    edited_text = []
-
-    # Mapping of markdown markers to their new format
-    mapping = {
-        "IMPORTANT": "important",
-        "NOTE": "note",
-        "TIP": "tip",
-        "WARNING": "caution",
-    }
+def _alert_to_admonition(match: re.Match) -> str:
+    lines = ["```{" + ALERT_ADMONITIONS[match.group(1)] + "}"]
+    # Skip empty lines within the block and remove '>' from the others
+    lines.extend(
+        line.lstrip("> ").rstrip()
+        for line in match.group("body").split("\n")
+        if line and line.strip() != ">"
+    )
+    text = "\n".join(lines)
+    if not match.group(0).endswith("\n"):
+        # The block runs until the end of the file
+        return text
+    if ALERT_RE.match(match.string, match.end()):
+        # The next line starts a new block
+        return text + "\n"
+    # End of the current block
+    return text + "\n```\n"
+
 
-    # Variable to keep track of the current block type
-    current_block_type = None
-
-    for line in lines:
-        # Check if the line starts with any of the markers
-        if any(line.strip().startswith(f"> [!{marker}]") for marker in mapping):
-            # Find the marker and set the current block type
-            current_block_type = next(
-                marker for marker in mapping if f"> [!{marker}]" in line
-            )
-            # Start of a new block
-            edited_text.append("```{" + mapping[current_block_type] + "}")
-        elif current_block_type and line.strip() == ">":
-            # Empty line within the block, skip it
-            continue
-        elif current_block_type and not line.strip().startswith(">"):
-            # End of the current block
-            edited_text.append("```")
-            edited_text.append(line)  # Add the current line as it is
-            current_block_type = None  # Reset the block type
-        elif current_block_type:
-            # Inside the block, so remove '>' and add the line
-            edited_text.append(line.lstrip("> ").rstrip())
-        else:
-            # Outside any block, add the line as it is
-            edited_text.append(line)
-
-    # Join the edited lines back into a single string
-    return "\n".join(edited_text)
+def _change_alerts_to_admonitions(input_text: str) -> str:
+    return ALERT_RE.sub(_alert_to_admonition, input_text)
 
 
 def change_alerts_to_admonitions(input_file: Path, output_file: Path) -> None:
@@ -151,41 +171,34 @@ def change_alerts_to_admonitions(input_file: Path, output_file: Path) -> None:
         outfile.write(new_content)
 
 
+def _replace_image_links(content: str) -> str:
+    return IMAGE_LINK_RE.sub(
+        lambda match: _IMAGE_LINK_REPLACEMENTS[match.group(0)],
+        content,
+    )
+
+
 def replace_image_links(input_file: Path, output_file: Path) -> None:
     """Replace relative links to `./imgs/` files with absolute links to GitHub."""
     with input_file.open("r") as infile:
         content = infile.read()
-    new_content = (
-        content.replace(
-            "(./imgs/",
-            "(https://raw.githubusercontent.com/sbalk/ViperBoxInterface/main/imgs/",
-        )
-        .replace(".png)", ".png?raw=true)")
-        .replace(".gif)", ".gif?raw=true)")
-    )
+    new_content = _replace_image_links(content)
     with output_file.open("w") as outfile:
         outfile.write(new_content)
 
 
+def _fix_anchors_with_named_emojis(content: str) -> str:
+    return EMOJI_ANCHOR_RE.sub("#", content)
+
+
 def fix_anchors_with_named_emojis(input_file: Path, output_file: Path) -> None:
     """Fix anchors with named emojis.
 
     WARNING: this currently hardcodes the emojis to remove.
     """
-    to_remove = [
-        "brain",
-        "books",
-        "desktop_computer",
-        "gear",
-        "question",
-        "robot",
-        "hammer_and_wrench",
-    ]
     with input_file.open("r") as infile:
         content = infile.read()
-    new_content = content
-    for emoji_name in to_remove:
-        new_content = new_content.replace(f"#{emoji_name}-", "#")
+    new_content = _fix_anchors_with_named_emojis(content)
     with output_file.open("w") as outfile:
         outfile.write(new_content)
 
@@ -317,13 +330,10 @@ def extract_headers_from_markdown(md_file_path: Path) -> list[tuple[int, str]]:
     with md_file_path.open("r") as infile:
         content = infile.read()
 
-    # Regex to match markdown headers (e.g., ## Header)
-    header_regex = re.compile(r"^(#+)\s+(.+)$", re.MULTILINE)
-
     # Extract headers
     return [
         (len(match.group(1)), match.group(2).strip())
-        for match in header_regex.finditer(content)
+        for match in HEADER_RE.finditer(content)
     ]
 
 
@@ -347,7 +357,8 @@ def replace_links_in_markdown(
     with md_file_path.open("r") as infile:
         content = infile.read()
 
-    # Replace links based on headers_mapping and links dictionary
+    # Map each old link target to its new one, the first file with the header wins
+    replacements: dict[str, str] = {}
     for file_name, headers in headers_mapping.items():
         for _header_level, header_text in headers:
             # Find the original slug for this header text from the links dictionary
@@ -356,11 +367,16 @@ def replace_links_in_markdown(
                 # Remove the '#' from the slug and update the link in the content
                 new_slug = normalize_slug(original_slug)
                 original_slug = original_slug.lstrip("#")
-                content = content.replace(
+                replacements.setdefault(
                     f"(#{original_slug})",
                     f"({file_name}{new_slug})",
                 )
 
+    # Replace all links in a single pass over the content
+    if replacements:
+        links_regex = re.compile("|".join(map(re.escape, replacements)))
+        content = links_regex.sub(lambda match: replacements[match.group(0)], content)
+
     # Write updated content back to file
     with md_file_path.open("w") as outfile:
         outfile.write(content)
@@ -384,11 +400,8 @@ def decrease_header_levels(md_file_path: Path) -> None:
         new_header_level = "#" * max(1, header_level - 1)  # Ensure at least one '#'
         return f"{new_header_level} {match.group(2)}"
 
-    # Regular expression for Markdown headers
-    header_regex = re.compile(r"^(#+)\s+(.+)$", re.MULTILINE)
-
     # Replace headers with decreased levels
-    new_content = header_regex.sub(lower_header_level, content)
+    new_content = HEADER_RE.sub(lower_header_level, content)
 
     # Write the updated content back to the file
     with md_file_path.open("w", encoding="utf-8") as file:
@@ -436,10 +449,14 @@ def process_readme_for_sphinx_docs(readme_path: Path, docs_path: Path) -> None:
     """
     # Step 1: Copy README.md to the Sphinx source directory and apply transformations
     output_file = docs_path / "source" / "README.md"
-    replace_named_emojis(readme_path, output_file)
-    change_alerts_to_admonitions(output_file, output_file)
-    replace_image_links(output_file, output_file)
-    fix_anchors_with_named_emojis(output_file, output_file)
+    with readme_path.open("r") as infile:
+        content = infile.read()
+    content = _replace_named_emojis(content)
+    content = _change_alerts_to_admonitions(content)
+    content = _replace_image_links(content)
+    content = _fix_anchors_with_named_emojis(content)
+    with output_file.open("w") as outfile:
+        outfile.write(content)
 
     # Step 2: Extract the table of contents links from the processed README
     links = extract_toc_links(output_file)
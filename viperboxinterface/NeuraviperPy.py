@@ -46,6 +46,7 @@ import logging.handlers
 import os
 import re
 import sys
+import threading
 from ctypes import (
     POINTER,
     c_bool,
@@ -61,9 +62,11 @@ from ctypes import (
     sizeof,
 )
 from enum import IntEnum
-from inspect import signature
 from sys import platform as _platform
 from types import FunctionType
+from typing import NamedTuple
+
+import numpy as np
 
 # logger = logging.getLogger(__name__)
 logger = logging.getLogger("NVP")
@@ -74,45 +77,82 @@ socketHandler = logging.handlers.SocketHandler(
 )
 logger.addHandler(socketHandler)
 
-if not (_platform.startswith("win32") or _platform.startswith("cygwin")):
-    raise RuntimeError("Not supported on this platform")
-
 _bundled_lib_path = None
 _lib_path = None
+_nvplib = None
+_load_lock = threading.Lock()
 _arch = "x86" if sizeof(c_void_p) == 4 else "x64"
-_pattern = f"NeuraviperAPI_[0-9]+_[0-9]+(_[0-9]+)?_{_arch}.dll"
+_pattern = re.compile(f"NeuraviperAPI_[0-9]+_[0-9]+(_[0-9]+)?_{_arch}.dll")
 
-for path in sys.path:
-    _this_dir = os.path.abspath(path)
 
-    try:
-        _files = [f for f in os.listdir(_this_dir) if re.search(_pattern, f)]
-    except FileNotFoundError:
-        continue
+def _load_lib() -> ctypes.CDLL:
+    """Find and load the NeuraViPeR API DLL, on first use instead of on import.
 
-    if _files:
-        _bundled_lib_path = os.path.join(_this_dir, sorted(_files, reverse=True)[0])
-        _lib_path = os.getenv("NEUROPIXPY_LIB", _bundled_lib_path)
-        break
+    After loading, all C functions created with `_c_function` are looked up in the
+    DLL and the wrappers that took them as default argument are pointed directly at
+    the ctypes functions, so later calls do not pass through the lazy stand-ins.
+    """
+    if _nvplib is not None:
+        return _nvplib
+    with _load_lock:
+        # Another thread may have loaded the library while we waited for the lock
+        if _nvplib is None:
+            _load_lib_locked()
+    return _nvplib
 
-# If we are running Cygwin/MSYS python, ensure that we use a valid Windows path
-if _platform.startswith("cygwin"):
-    import subprocess
 
-    _lib_path = (
-        subprocess.check_output(["cygpath", "-w", _lib_path]).decode("utf-8").strip()
-    )
+def _load_lib_locked() -> None:
+    global _bundled_lib_path, _lib_path, _nvplib
+    if not (_platform.startswith("win32") or _platform.startswith("cygwin")):
+        raise RuntimeError("Not supported on this platform")
 
-try:
-    print(f"Found NeuraViPeR API DLL: {_lib_path}")
-    _nvplib = ctypes.CDLL(_lib_path)
-    print("Successfully loaded", _nvplib)
-except Exception as e:
-    raise RuntimeError(f"Could not load NeuraViPeR API DLL: {_lib_path}") from e
+    for path in sys.path:
+        _this_dir = os.path.abspath(path)
+
+        try:
+            _files = [f for f in os.listdir(_this_dir) if _pattern.search(f)]
+        except FileNotFoundError:
+            continue
+
+        if _files:
+            _bundled_lib_path = os.path.join(_this_dir, max(_files))
+            _lib_path = os.getenv("NEUROPIXPY_LIB", _bundled_lib_path)
+            break
+
+    # If we are running Cygwin/MSYS python, ensure that we use a valid Windows path
+    if _platform.startswith("cygwin"):
+        import subprocess
+
+        _lib_path = (
+            subprocess.check_output(["cygpath", "-w", _lib_path])
+            .decode("utf-8")
+            .strip()
+        )
+
+    try:
+        logger.info("Found NeuraViPeR API DLL: %s", _lib_path)
+        lib = ctypes.CDLL(_lib_path)
+        logger.info("Successfully loaded %s", lib)
+    except Exception as e:
+        raise RuntimeError(f"Could not load NeuraViPeR API DLL: {_lib_path}") from e
+
+    for c_function in _c_functions:
+        c_function.bind(lib)
+    for obj in globals().values():
+        # Only the wrappers of this module, not functions imported from elsewhere
+        if not isinstance(obj, FunctionType) or obj.__module__ != __name__:
+            continue
+        if any(isinstance(d, _CFunction) for d in obj.__defaults__ or ()):
+            obj.__defaults__ = tuple(
+                d.c_fn if isinstance(d, _CFunction) else d for d in obj.__defaults__
+            )
+    _nvplib = lib
 
 
 def free_library() -> None:
     # Frees the loaded library
+    if _nvplib is None:
+        return
     kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
     kernel32.FreeLibrary.argtypes = [ctypes.wintypes.HMODULE]
     kernel32.FreeLibrary(_nvplib._handle)
@@ -123,48 +163,76 @@ def free_library() -> None:
 #
 
 
-def _c_fn(*args):
-    """Dummy wrapped function"""
-    None
+class _CFunction:
+    """C API function that is looked up in the DLL by `_load_lib`."""
+
+    __slots__ = ("function_name", "res_type", "arg_types", "c_fn")
+
+    def __init__(self, function_name, res_type, arg_types):
+        self.function_name = function_name
+        self.res_type = res_type
+        self.arg_types = arg_types
+        self.c_fn = None
+
+    def bind(self, lib):
+        c_fn = getattr(lib, self.function_name)
+        c_fn.restype = self.res_type
+        c_fn.argtypes = self.arg_types
+        logger.debug(
+            "NVP API function %s called with argument types %s",
+            self.function_name,
+            self.arg_types,
+        )
+        self.c_fn = c_fn
+        return c_fn
+
+    def __call__(self, *args):
+        if self.c_fn is None:
+            _load_lib()
+        return self.c_fn(*args)
+
+
+_c_functions: list[_CFunction] = []
 
 
 def _c_function(function_name, res_type, arg_types):
     """Create wrapped C API function.
 
+    The DLL is only loaded when one of the functions is called for the first time.
+
     Parameters
     ----------
         function_name (string): Name of the function to be wrapped
         res_type (type): Type of return value
         arg_types (List[type]): List of argument types
     """
-    c_fn = getattr(_nvplib, function_name)
-    c_fn.restype = res_type
-    c_fn.argtypes = arg_types
-    logging.debug(
-        f"NVP API function {function_name} called with argument types {arg_types}",
-    )
+    c_fn = _CFunction(function_name, res_type, arg_types)
+    _c_functions.append(c_fn)
     return c_fn
 
 
-def _wrap_function(function_name, res_type, arg_types):
-    """Implicit wrapping of imported C function.
-    Injects `_c_fn' into the environment of wrapped function.
-    """
-    # Make a copy of the global environment and inject C function
-    env = globals().copy()
-    env["_c_fn"] = _c_function(function_name, res_type, arg_types)
-
-    def decorator(func):
-        new_fn = FunctionType(func.__code__, env, name=func.__name__)
-        new_fn.__signature__ = signature(func)
-        return new_fn
-
-    return decorator
+# Wrappers take their C function as the `_c_fn` default argument, so calls
+# resolve it as a local variable.
 
 
 class Struct(ctypes.Structure):
     ":meta private:"
 
+    def __init_subclass__(cls, **kwargs):
+        # Generate __str__/__repr__ once per class, dataclass style, so printing a
+        # struct reads the fields directly instead of building a dict first
+        super().__init_subclass__(**kwargs)
+        fields = cls.__dict__.get("_fields_")
+        if not fields:
+            return
+        body = ", ".join(f"{field[0]!r}: {{self.{field[0]}!r}}" for field in fields)
+        namespace = {}
+        exec(
+            f'def __str__(self):\n    return f"<({cls.__name__}){{{{{body}}}}}>"\n',
+            namespace,
+        )
+        cls.__str__ = cls.__repr__ = namespace["__str__"]
+
     def __repr__(self) -> str:
         return str(self)
 
@@ -257,15 +325,17 @@ class HardwareID(Struct):
 
     @property
     def product_number(self) -> str:
-        try:
-            pn = self._product_number.decode("ASCII")
-            return pn
-        except UnicodeDecodeError:
-            return ""
+        # Decoded once, the buffer is filled by the API before it is read
+        pn = self.__dict__.get("_pn_cached")
+        if pn is None:
+            pn = self._product_number.rstrip(b"\x00").decode("ASCII", "replace")
+            self.__dict__["_pn_cached"] = pn
+        return pn
 
     @product_number.setter
     def product_number(self, value: str):
         self._product_number = value.encode("ASCII")
+        self.__dict__.pop("_pn_cached", None)
 
     @property
     def version(self) -> tuple[c_uint8, c_uint8]:
@@ -289,13 +359,16 @@ class PacketInfo(Struct):
     ]
 
 
-class Packet:
-    def __init__(self, timestamp, status, payloadlength, sessionID, data):
-        self.timestamp = timestamp
-        self.status = status
-        self.payloadlength = payloadlength
-        self.sessionID = sessionID
-        self.data = data
+# NumPy layout of a `PacketInfo` record, including the C struct padding
+_PACKETINFO_DTYPE = np.dtype(PacketInfo)
+
+
+class Packet(NamedTuple):
+    timestamp: int
+    status: int
+    payloadlength: int
+    sessionID: int
+    data: np.ndarray
 
 
 class DiagStats(Struct):
@@ -377,8 +450,10 @@ error_dct = {
 #
 
 
-@_wrap_function("getLastErrorMessage", c_size_t, [c_char_p, c_size_t])
-def getLastError() -> str:
+_getLastError = _c_function("getLastErrorMessage", c_size_t, [c_char_p, c_size_t])
+
+
+def getLastError(_c_fn=_getLastError) -> str:
     """Returns last error message reported by API.
 
     :rtype: String
@@ -397,33 +472,36 @@ class NeuraviperAPIError(Exception):
         self.errorcode = errorcode
 
 
-def __assertnvperror(nvperror):
-    if nvperror != 0:
-        logger.warning(error_dct[nvperror])
-        print(f"custom print by me: {error_dct[nvperror]}")
-        raise NeuraviperAPIError(nvperror)
-    else:
-        logging.debug("Previous NVP API call successful")
+def _check(
+    nvperror,
+    _errors=error_dct.get,
+    _log=logger.error,
+    _error=NeuraviperAPIError,
+):
+    """Raise `NeuraviperAPIError` if an API call returned an error code."""
+    if nvperror:
+        _log(_errors(nvperror, f"UNKNOWN, Unknown error code {nvperror}"))
+        raise _error(nvperror)
+
+
+_getLogLevel = _c_function("getLogLevel", c_int, [])
 
 
-@_wrap_function("getLogLevel", c_int, [])
-def getLogLevel() -> LogLevel:
+def getLogLevel(_c_fn=_getLogLevel) -> LogLevel:
     lvl = _c_fn()
     return LogLevel(lvl)
 
 
-def setLogLevel(level: LogLevel) -> None:
+_setLogLevel = _c_function("setLogLevel", None, [c_int])
+
+
+def setLogLevel(level: LogLevel, _c_fn=_setLogLevel) -> None:
     """Set the logging level of the API.
 
     :param level: Required logging level
-    :type level: DebugLevel
+    :type level: LogLevel
     """
-    if not isinstance(level, LogLevel):
-        raise NeuraviperAPIError(
-            42,
-            "Debug level must be set using DebugLevel enumeration!",
-        )
-    _nvplib.setLogLevel(level.value)
+    _c_fn(int(level))
 
 
 #
@@ -431,8 +509,12 @@ def setLogLevel(level: LogLevel) -> None:
 #
 
 
-@_wrap_function("getAPIVersion", None, [POINTER(c_int), POINTER(c_int), POINTER(c_int)])
-def getAPIVersion() -> tuple[int, int, int]:
+_getAPIVersion = _c_function(
+    "getAPIVersion", None, [POINTER(c_int), POINTER(c_int), POINTER(c_int)]
+)
+
+
+def getAPIVersion(_c_fn=_getAPIVersion) -> tuple[int, int, int]:
     """Get the API version.
 
     :return: A tuple with the major, minor, and patch version numbers
@@ -445,13 +527,17 @@ def getAPIVersion() -> tuple[int, int, int]:
     return (v_maj.value, v_min.value, v_patch.value)
 
 
-@_wrap_function("scanBS", NVP_ErrorCode, [])
-def scanBS() -> None:
-    __assertnvperror(_c_fn())
+_scanBS = _c_function("scanBS", NVP_ErrorCode, [])
 
 
-@_wrap_function("getDeviceList", c_int, [POINTER(BasestationID), c_int])
-def getDeviceList(count: int) -> list[BasestationID]:
+def scanBS(_c_fn=_scanBS) -> None:
+    _check(_c_fn())
+
+
+_getDeviceList = _c_function("getDeviceList", c_int, [POINTER(BasestationID), c_int])
+
+
+def getDeviceList(count: int, _c_fn=_getDeviceList) -> list[BasestationID]:
     """Returns a list of connected devices.
 
     :param count: Maximum number of devices to be reported
@@ -463,224 +549,379 @@ def getDeviceList(count: int) -> list[BasestationID]:
     return list(arr)[0:ret]
 
 
-@_wrap_function("createHandle", NVP_ErrorCode, [POINTER(DeviceHandle), c_int])
-def createHandle(serial_number: int) -> DeviceHandle:
+_createHandle = _c_function(
+    "createHandle", NVP_ErrorCode, [POINTER(DeviceHandle), c_int]
+)
+
+
+def createHandle(serial_number: int, _c_fn=_createHandle) -> DeviceHandle:
     ptr = c_void_p()
-    __assertnvperror(_c_fn(ctypes.byref(ptr), serial_number))
+    _check(_c_fn(ctypes.byref(ptr), serial_number))
     return ptr
 
 
-@_wrap_function("destroyHandle", NVP_ErrorCode, [DeviceHandle])
-def destroyHandle(handle: DeviceHandle):
-    __assertnvperror(_c_fn(handle))
+_destroyHandle = _c_function("destroyHandle", NVP_ErrorCode, [DeviceHandle])
+
+
+def destroyHandle(handle: DeviceHandle, _c_fn=_destroyHandle):
+    _check(_c_fn(handle))
+
+
+_openBS = _c_function("openBS", NVP_ErrorCode, [DeviceHandle])
+
+
+def openBS(handle: DeviceHandle, _c_fn=_openBS):
+    _check(_c_fn(handle))
 
 
-@_wrap_function("openBS", NVP_ErrorCode, [DeviceHandle])
-def openBS(handle: DeviceHandle):
-    __assertnvperror(_c_fn(handle))
+_closeBS = _c_function("closeBS", NVP_ErrorCode, [DeviceHandle])
 
 
-@_wrap_function("closeBS", NVP_ErrorCode, [DeviceHandle])
-def closeBS(handle: DeviceHandle):
-    __assertnvperror(_c_fn(handle))
+def closeBS(handle: DeviceHandle, _c_fn=_closeBS):
+    _check(_c_fn(handle))
 
 
-@_wrap_function("openProbes", NVP_ErrorCode, [DeviceHandle])
-def openProbes(handle: DeviceHandle):
-    __assertnvperror(_c_fn(handle))
+_openProbes = _c_function("openProbes", NVP_ErrorCode, [DeviceHandle])
 
 
-@_wrap_function("closeProbes", NVP_ErrorCode, [DeviceHandle])
-def closeProbes(handle: DeviceHandle):
-    __assertnvperror(_c_fn(handle))
+def openProbes(handle: DeviceHandle, _c_fn=_openProbes):
+    _check(_c_fn(handle))
 
 
-@_wrap_function("init", NVP_ErrorCode, [DeviceHandle, c_uint8])
-def init(handle: DeviceHandle, probe: int):
-    __assertnvperror(_c_fn(handle, probe))
+_closeProbes = _c_function("closeProbes", NVP_ErrorCode, [DeviceHandle])
 
 
-@_wrap_function(
+def closeProbes(handle: DeviceHandle, _c_fn=_closeProbes):
+    _check(_c_fn(handle))
+
+
+_init = _c_function("init", NVP_ErrorCode, [DeviceHandle, c_uint8])
+
+
+def init(handle: DeviceHandle, probe: int, _c_fn=_init):
+    _check(_c_fn(handle, probe))
+
+
+def _uint8_array(buffer: bytes | bytearray, size: int):
+    """Return `buffer` as a ctypes uint8 array, sharing memory if it is writable."""
+    if isinstance(buffer, bytearray) or (
+        isinstance(buffer, memoryview) and not buffer.readonly
+    ):
+        return (c_uint8 * size).from_buffer(buffer)
+    return (c_uint8 * size).from_buffer_copy(buffer)
+
+
+_transferSPI = _c_function(
     "transferSPI",
     NVP_ErrorCode,
     [DeviceHandle, c_uint8, POINTER(c_uint8), POINTER(c_uint8), c_size_t],
 )
-def transferSPI(handle: DeviceHandle, probe: int, buffer: bytes) -> bytes:
+
+
+def transferSPI(
+    handle: DeviceHandle,
+    probe: int,
+    buffer: bytes | bytearray,
+    _c_fn=_transferSPI,
+    _check=_check,
+) -> bytes:
     size = len(buffer)
-    output = (c_uint8 * size).from_buffer_copy(buffer)
+    output = _uint8_array(buffer, size)
     input = (c_uint8 * size)()
-    __assertnvperror(_c_fn(handle, probe, output, input, size))
+    _check(_c_fn(handle, probe, output, input, size))
     return bytes(input)
 
 
-@_wrap_function(
+_writeSPI = _c_function(
     "writeSPI",
     NVP_ErrorCode,
     [DeviceHandle, c_uint8, POINTER(c_uint8), c_size_t],
 )
-def writeSPI(handle: DeviceHandle, probe: int, buffer: bytes):
+
+
+def writeSPI(
+    handle: DeviceHandle,
+    probe: int,
+    buffer: bytes | bytearray,
+    _c_fn=_writeSPI,
+    _check=_check,
+):
     size = len(buffer)
-    output = (c_uint8 * size).from_buffer_copy(buffer)
-    __assertnvperror(_c_fn(handle, probe, output, size))
+    output = _uint8_array(buffer, size)
+    _check(_c_fn(handle, probe, output, size))
 
 
-@_wrap_function(
+_writeI2C = _c_function(
     "writeI2C",
     NVP_ErrorCode,
     [DeviceHandle, c_uint8, c_uint8, POINTER(c_uint8), c_size_t],
 )
+
+
 def writeI2C(
     handle: DeviceHandle,
     device: int,
     address: int,
     bytearr: bytearray,
+    _c_fn=_writeI2C,
 ) -> None:
     data = (c_char * len(bytearr)).from_buffer(bytearr)
-    __assertnvperror(_c_fn(handle, device, address, data, len(bytearr)))
+    _check(_c_fn(handle, device, address, data, len(bytearr)))
 
 
-@_wrap_function(
+_readI2C = _c_function(
     "readI2C",
     NVP_ErrorCode,
     [DeviceHandle, c_uint8, c_uint8, POINTER(c_uint8), c_size_t],
 )
-def readI2C(handle: DeviceHandle, device: int, address: int, length: int) -> bytearray:
+
+
+def readI2C(
+    handle: DeviceHandle, device: int, address: int, length: int, _c_fn=_readI2C
+) -> bytearray:
     b = bytearray(length)
     ptr = (c_char * length).from_buffer(b)
-    __assertnvperror(_c_fn(handle, device, address, ptr, length))
+    _check(_c_fn(handle, device, address, ptr, length))
     return b
 
 
-@_wrap_function(
+_writeI2Cctrl = _c_function(
     "writeI2Cctrl",
     NVP_ErrorCode,
     [DeviceHandle, c_int, c_uint8, c_uint8, POINTER(c_uint8), c_size_t],
 )
+
+
 def writeI2Cctrl(
     handle: DeviceHandle,
     device: int,
     address: int,
     bytearr: bytearray,
+    _c_fn=_writeI2Cctrl,
 ) -> None:
     data = (c_char * len(bytearr)).from_buffer(bytearr)
-    __assertnvperror(_c_fn(handle, device, address, data, len(bytearr)))
+    _check(_c_fn(handle, device, address, data, len(bytearr)))
 
 
-@_wrap_function(
+_readI2Cctrl = _c_function(
     "readI2Cctrl",
     NVP_ErrorCode,
     [DeviceHandle, c_int, c_uint8, c_uint8, POINTER(c_uint8), c_size_t],
 )
+
+
 def readI2Cctrl(
     handle: DeviceHandle,
     device: int,
     address: int,
     length: int,
+    _c_fn=_readI2Cctrl,
 ) -> bytearray:
     b = bytearray(length)
     ptr = (c_char * length).from_buffer(b)
-    __assertnvperror(_c_fn(handle, device, address, ptr, length))
+    _check(_c_fn(handle, device, address, ptr, length))
     return b
 
 
-@_wrap_function("setGain", NVP_ErrorCode, [DeviceHandle, c_uint8, c_int, c_int])
-def setGain(handle: DeviceHandle, probe: int, channel: int, gain: int):
-    __assertnvperror(_c_fn(handle, probe, channel, gain))
+_setGain = _c_function("setGain", NVP_ErrorCode, [DeviceHandle, c_uint8, c_int, c_int])
+
+
+def setGain(handle: DeviceHandle, probe: int, channel: int, gain: int, _c_fn=_setGain):
+    _check(_c_fn(handle, probe, channel, gain))
 
 
-@_wrap_function(
+_writeChannelConfiguration = _c_function(
     "writeChannelConfiguration",
     NVP_ErrorCode,
     [DeviceHandle, c_uint8, c_bool],
 )
-def writeChannelConfiguration(handle: DeviceHandle, probe: int, readCheck: bool):
-    __assertnvperror(_c_fn(handle, probe, readCheck))
 
 
-@_wrap_function("setOSimage", NVP_ErrorCode, [DeviceHandle, c_uint8, POINTER(c_uint8)])
-def setOSimage(handle: DeviceHandle, probe: int, buffer: bytes):
+def writeChannelConfiguration(
+    handle: DeviceHandle, probe: int, readCheck: bool, _c_fn=_writeChannelConfiguration
+):
+    _check(_c_fn(handle, probe, readCheck))
+
+
+_setOSimage = _c_function(
+    "setOSimage", NVP_ErrorCode, [DeviceHandle, c_uint8, POINTER(c_uint8)]
+)
+
+
+def setOSimage(handle: DeviceHandle, probe: int, buffer: bytes, _c_fn=_setOSimage):
     size = len(buffer)
     output = (c_uint8 * size).from_buffer_copy(buffer)
-    __assertnvperror(_c_fn(handle, probe, output))
+    _check(_c_fn(handle, probe, output))
 
 
-@_wrap_function(
+_writeOsConfiguration = _c_function(
     "writeOSConfiguration",
     NVP_ErrorCode,
     [DeviceHandle, c_uint8, c_bool, c_bool],
 )
+
+
 def writeOsConfiguration(
     handle: DeviceHandle,
     probe: int,
     readCheck: bool,
     skip_sync_check: bool,
+    _c_fn=_writeOsConfiguration,
 ):
-    __assertnvperror(_c_fn(handle, probe, readCheck, skip_sync_check))
+    _check(_c_fn(handle, probe, readCheck, skip_sync_check))
+
 
+_arm = _c_function("arm", NVP_ErrorCode, [DeviceHandle])
 
-@_wrap_function("arm", NVP_ErrorCode, [DeviceHandle])
-def arm(handle: DeviceHandle) -> None:
-    __assertnvperror(_c_fn(handle))
 
+def arm(handle: DeviceHandle, _c_fn=_arm, _check=_check) -> None:
+    _check(_c_fn(handle))
 
-@_wrap_function("setSWTrigger", NVP_ErrorCode, [DeviceHandle])
-def setSWTrigger(handle: DeviceHandle) -> None:
-    __assertnvperror(_c_fn(handle))
 
+_setSWTrigger = _c_function("setSWTrigger", NVP_ErrorCode, [DeviceHandle])
 
-@_wrap_function("setSyncClockFrequency", NVP_ErrorCode, [DeviceHandle, c_double])
-def setSyncClockFrequency(handle: DeviceHandle, frequency: float) -> None:
-    __assertnvperror(_c_fn(handle, frequency))
 
+def setSWTrigger(handle: DeviceHandle, _c_fn=_setSWTrigger, _check=_check) -> None:
+    _check(_c_fn(handle))
 
-@_wrap_function(
+
+_setSyncClockFrequency = _c_function(
+    "setSyncClockFrequency", NVP_ErrorCode, [DeviceHandle, c_double]
+)
+
+
+def setSyncClockFrequency(
+    handle: DeviceHandle, frequency: float, _c_fn=_setSyncClockFrequency
+) -> None:
+    _check(_c_fn(handle, frequency))
+
+
+_getSyncClockFrequency = _c_function(
     "getSyncClockFrequency",
     NVP_ErrorCode,
     [DeviceHandle, POINTER(c_double)],
 )
-def getSyncClockFrequency(handle: DeviceHandle) -> float:
+
+
+def getSyncClockFrequency(handle: DeviceHandle, _c_fn=_getSyncClockFrequency) -> float:
     freq = c_double(0)
-    __assertnvperror(_c_fn(handle, freq))
+    _check(_c_fn(handle, freq))
     return freq.value
 
 
-@_wrap_function("setSyncClockPeriod", NVP_ErrorCode, [DeviceHandle, c_uint])
-def setSyncClockPeriod(handle: DeviceHandle, period: int) -> None:
-    __assertnvperror(_c_fn(handle, period))
+_setSyncClockPeriod = _c_function(
+    "setSyncClockPeriod", NVP_ErrorCode, [DeviceHandle, c_uint]
+)
+
+
+def setSyncClockPeriod(
+    handle: DeviceHandle, period: int, _c_fn=_setSyncClockPeriod
+) -> None:
+    _check(_c_fn(handle, period))
 
 
-@_wrap_function("getSyncClockPeriod", NVP_ErrorCode, [DeviceHandle, POINTER(c_uint)])
-def getSyncClockPeriod(handle: DeviceHandle) -> int:
+_getSyncClockPeriod = _c_function(
+    "getSyncClockPeriod", NVP_ErrorCode, [DeviceHandle, POINTER(c_uint)]
+)
+
+
+def getSyncClockPeriod(handle: DeviceHandle, _c_fn=_getSyncClockPeriod) -> int:
     period = c_uint(0)
-    __assertnvperror(_c_fn(handle, period))
+    _check(_c_fn(handle, period))
     return period.value
 
 
-@_wrap_function("setSyncMode", NVP_ErrorCode, [DeviceHandle, c_int])
-def setSyncMode(handle: DeviceHandle, mode: SyncMode) -> None:
-    __assertnvperror(_c_fn(handle, mode.value))
+_setSyncMode = _c_function("setSyncMode", NVP_ErrorCode, [DeviceHandle, c_int])
+
+
+def setSyncMode(handle: DeviceHandle, mode: SyncMode, _c_fn=_setSyncMode) -> None:
+    _check(_c_fn(handle, mode.value))
+
+
+_getSyncMode = _c_function("getSyncMode", NVP_ErrorCode, [DeviceHandle, POINTER(c_int)])
 
 
-@_wrap_function("getSyncMode", NVP_ErrorCode, [DeviceHandle, POINTER(c_int)])
-def getSyncMode(handle: DeviceHandle) -> SyncMode:
+def getSyncMode(handle: DeviceHandle, _c_fn=_getSyncMode) -> SyncMode:
     mode = c_int(0)
-    __assertnvperror(_c_fn(handle, mode))
+    _check(_c_fn(handle, mode))
     return SyncMode(mode.value)
 
 
-@_wrap_function("setTriggerMode", NVP_ErrorCode, [DeviceHandle, c_int])
-def setTriggerMode(handle: DeviceHandle, mode: TriggerMode) -> None:
-    __assertnvperror(_c_fn(handle, mode.value))
+_setTriggerMode = _c_function("setTriggerMode", NVP_ErrorCode, [DeviceHandle, c_int])
+
+
+def setTriggerMode(
+    handle: DeviceHandle, mode: TriggerMode, _c_fn=_setTriggerMode
+) -> None:
+    _check(_c_fn(handle, mode.value))
+
+
+_getTriggerMode = _c_function(
+    "getTriggerMode", NVP_ErrorCode, [DeviceHandle, POINTER(c_int)]
+)
 
 
-@_wrap_function("getTriggerMode", NVP_ErrorCode, [DeviceHandle, POINTER(c_int)])
-def getTriggerMode(handle: DeviceHandle) -> TriggerMode:
+def getTriggerMode(handle: DeviceHandle, _c_fn=_getTriggerMode) -> TriggerMode:
     mode = c_int(0)
-    __assertnvperror(_c_fn(handle, mode))
+    _check(_c_fn(handle, mode))
     return TriggerMode(mode.value)
 
 
-@_wrap_function(
+# Per-thread cache of the buffers handed to the packet reading functions,
+# keyed by packet count. The API overwrites them on every call.
+_buf_cache = threading.local()
+
+
+def _packet_buffers(packet_count: int):
+    """Return reusable ``(info_arr, data_arr, packets_read)`` ctypes objects.
+
+    The buffers are overwritten by the next read with the same packet count in
+    the same thread, so their content has to be copied out before that.
+    """
+    cache = _buf_cache.__dict__.setdefault("buffers", {})
+    buffers = cache.get(packet_count)
+    if buffers is None:
+        # One allocation holding the info array followed by the data array
+        info_size = sizeof(PacketInfo) * packet_count
+        raw = ctypes.create_string_buffer(
+            info_size + sizeof(c_int16) * 64 * packet_count
+        )
+        buffers = cache[packet_count] = (
+            (PacketInfo * packet_count).from_buffer(raw),
+            (c_int16 * (packet_count * 64)).from_buffer(raw, info_size),
+            c_int(0),
+        )
+    else:
+        buffers[2].value = 0
+    return buffers
+
+
+def _unpack_packets(
+    info_arr,
+    data_arr,
+    packets_read: int,
+    legacy: bool = False,
+) -> tuple[np.ndarray, np.ndarray] | list[Packet]:
+    """Convert the ctypes buffers filled by the API into NumPy arrays.
+
+    Returns a tuple ``(info, data)`` where ``info`` is a structured array with the
+    `PacketInfo` fields and ``data`` is an ``(packets_read, 64)`` int16 array. Both
+    are copies, so they stay valid after the ctypes buffers are reused.
+    With ``legacy=True`` a list of `Packet` objects is returned instead, whose
+    ``data`` is the matching row of the data array.
+    """
+    channel_count = 64
+    # Copy straight from the ctypes buffers into the owning result arrays
+    info_np = np.empty(packets_read, dtype=_PACKETINFO_DTYPE)
+    ctypes.memmove(info_np.ctypes.data, info_arr, info_np.nbytes)
+    data_np = np.empty((packets_read, channel_count), dtype=np.int16)
+    ctypes.memmove(data_np.ctypes.data, data_arr, data_np.nbytes)
+    if legacy:
+        return [Packet(*info, data) for info, data in zip(info_np.tolist(), data_np)]
+    return info_np, data_np
+
+
+_readElectrodeData = _c_function(
     "readElectrodeData",
     NVP_ErrorCode,
     [
@@ -693,26 +934,45 @@ def getTriggerMode(handle: DeviceHandle) -> TriggerMode:
         POINTER(c_int),
     ],
 )
+
+
 def readElectrodeData(
     handle: DeviceHandle,
     probe: int,
     packet_count: int,
-) -> list[Packet]:
+    legacy: bool = False,
+    _c_fn=_readElectrodeData,
+    _check=_check,
+) -> tuple[np.ndarray, np.ndarray] | list[Packet]:
+    """Read electrode data.
+
+    ``data`` is a C-contiguous ``int16[:, :]`` array with one row per packet, so
+    it can be processed without leaving native arrays, e.g. with Numba::
+
+        @numba.njit
+        def count_crossings(data, threshold):
+            counts = np.zeros(data.shape[1], dtype=np.int64)
+            for i in range(data.shape[0]):
+                for ch in range(data.shape[1]):
+                    if data[i, ch] > threshold:
+                        counts[ch] += 1
+            return counts
+
+        info, data = readElectrodeData(handle, probe, 1000)
+        counts = count_crossings(data, 500)
+    """
     # Read electrode data
     # handle: device handle got by createHandle()
     # probe: number of focussed probe: 0...3
     # packet_count: number of packets to read (the number actually read can be lower)
-    # Return: list of "Packet"
+    # legacy: return a list of "Packet" instead of NumPy arrays
+    # Return: (info, data), see _unpack_packets()
 
     channel_count = 64  # Channel count must be 64
-    packets_read = c_int(0)  # Class constructor; packets_read.value = 0
-    info_arr = (
-        PacketInfo * packet_count
-    )()  # Ctypes way of defining an array of packet_count times a PacketInfo element;
-    # (): empty
-    data_arr = (c_int16 * (packet_count * channel_count))()
-
-    __assertnvperror(
+    # Buffers are reused between calls, _unpack_packets() copies the data out
+    info_arr, data_arr, packets_read = _packet_buffers(packet_count)
+
+    _check(
         _c_fn(
             handle,
             probe,
@@ -724,111 +984,172 @@ def readElectrodeData(
         ),
     )
 
-    packets = [None] * packets_read.value
-    for i in range(packets_read.value):
-        info = info_arr[i]
-        offset = i * channel_count
-        data = data_arr[offset : offset + channel_count]
-        packets[i] = Packet(
-            info.Timestamp,
-            info.Status,
-            info.payloadlength,
-            info.session_id,
-            data,
+    return _unpack_packets(info_arr, data_arr, packets_read.value, legacy)
+
+
+def readElectrodeDataStream(
+    handle: DeviceHandle,
+    probe: int,
+    packet_count: int,
+    batches: int,
+    _c_fn=_readElectrodeData,
+    _check=_check,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Read ``batches`` times `packet_count` packets into one pair of arrays.
+
+    Returns the same ``(info, data)`` layout as `readElectrodeData`, but the API
+    writes each batch straight into the preallocated result, so there are no
+    intermediate buffers or copies between the reads. The result only holds the
+    packets actually read, which can be fewer than ``batches * packet_count``.
+    """
+    channel_count = 64  # Channel count must be 64
+    info_np = np.empty(batches * packet_count, dtype=_PACKETINFO_DTYPE)
+    data_np = np.empty((batches * packet_count, channel_count), dtype=np.int16)
+    packets_read = c_int(0)
+    total = 0
+    for _ in range(batches):
+        _check(
+            _c_fn(
+                handle,
+                probe,
+                info_np[total:].ctypes.data_as(POINTER(PacketInfo)),
+                data_np[total:].ctypes.data_as(POINTER(c_int16)),
+                channel_count,
+                packet_count,
+                packets_read,
+            ),
         )
-    return packets
+        total += packets_read.value
+    return info_np[:total], data_np[:total]
 
 
-@_wrap_function("readDiagStats", NVP_ErrorCode, [DeviceHandle, POINTER(DiagStats)])
-def readDiagStats(handle: DeviceHandle) -> DiagStats:
+_readDiagStats = _c_function(
+    "readDiagStats", NVP_ErrorCode, [DeviceHandle, POINTER(DiagStats)]
+)
+
+
+def readDiagStats(handle: DeviceHandle, _c_fn=_readDiagStats) -> DiagStats:
     stats = DiagStats()
-    __assertnvperror(_c_fn(handle, stats))
+    _check(_c_fn(handle, stats))
     return stats
 
 
-@_wrap_function("readBSHardwareID", NVP_ErrorCode, [DeviceHandle, POINTER(HardwareID)])
-def readBSHardwareID(handle: DeviceHandle) -> HardwareID:
+_readBSHardwareID = _c_function(
+    "readBSHardwareID", NVP_ErrorCode, [DeviceHandle, POINTER(HardwareID)]
+)
+
+
+def readBSHardwareID(handle: DeviceHandle, _c_fn=_readBSHardwareID) -> HardwareID:
     hwid = HardwareID()
-    __assertnvperror(_c_fn(handle, hwid))
+    _check(_c_fn(handle, hwid))
     return hwid
 
 
-@_wrap_function("readHSHardwareID", NVP_ErrorCode, [DeviceHandle, POINTER(HardwareID)])
-def readHSHardwareID(handle: DeviceHandle) -> HardwareID:
+_readHSHardwareID = _c_function(
+    "readHSHardwareID", NVP_ErrorCode, [DeviceHandle, POINTER(HardwareID)]
+)
+
+
+def readHSHardwareID(handle: DeviceHandle, _c_fn=_readHSHardwareID) -> HardwareID:
     hwid = HardwareID()
-    __assertnvperror(_c_fn(handle, hwid))
+    _check(_c_fn(handle, hwid))
     return hwid
 
 
-@_wrap_function(
+_readMezzanineHardwareID = _c_function(
     "readMezzanineHardwareID",
     NVP_ErrorCode,
     [DeviceHandle, c_uint8, POINTER(HardwareID)],
 )
-def readMezzanineHardwareID(handle: DeviceHandle, probe: int) -> HardwareID:
+
+
+def readMezzanineHardwareID(
+    handle: DeviceHandle, probe: int, _c_fn=_readMezzanineHardwareID
+) -> HardwareID:
     hwid = HardwareID()
-    __assertnvperror(_c_fn(handle, probe, hwid))
+    _check(_c_fn(handle, probe, hwid))
     return hwid
 
 
-@_wrap_function(
+_readProbeHardwareID = _c_function(
     "readProbeHardwareID",
     NVP_ErrorCode,
     [DeviceHandle, c_uint8, POINTER(HardwareID)],
 )
-def readProbeHardwareID(handle: DeviceHandle, probe: int) -> HardwareID:
+
+
+def readProbeHardwareID(
+    handle: DeviceHandle, probe: int, _c_fn=_readProbeHardwareID
+) -> HardwareID:
     hwid = HardwareID()
-    __assertnvperror(_c_fn(handle, probe, hwid))
+    _check(_c_fn(handle, probe, hwid))
     return hwid
 
 
-@_wrap_function("setFileStream", NVP_ErrorCode, [DeviceHandle, c_char_p])
-def setFileStream(handle: DeviceHandle, filename: str) -> None:
+_setFileStream = _c_function("setFileStream", NVP_ErrorCode, [DeviceHandle, c_char_p])
+
+
+def setFileStream(handle: DeviceHandle, filename: str, _c_fn=_setFileStream) -> None:
     if filename != "":
-        __assertnvperror(_c_fn(handle, filename.encode("ASCII")))
+        _check(_c_fn(handle, filename.encode("ASCII")))
     else:
-        __assertnvperror(_c_fn(handle, None))  # to unlock a file
+        _check(_c_fn(handle, None))  # to unlock a file
+
+
+_enableFileStream = _c_function(
+    "enableFileStream", NVP_ErrorCode, [DeviceHandle, c_bool]
+)
 
 
-@_wrap_function("enableFileStream", NVP_ErrorCode, [DeviceHandle, c_bool])
-def enableFileStream(handle: DeviceHandle, enable: bool) -> None:
-    __assertnvperror(_c_fn(handle, enable))
+def enableFileStream(
+    handle: DeviceHandle, enable: bool, _c_fn=_enableFileStream
+) -> None:
+    _check(_c_fn(handle, enable))
 
 
-@_wrap_function(
+_streamOpenFile = _c_function(
     "streamOpenFile",
     NVP_ErrorCode,
     [c_char_p, POINTER(StreamHandle), c_uint8],
 )
-def streamOpenFile(filename: str, probe: int) -> StreamHandle:
+
+
+def streamOpenFile(filename: str, probe: int, _c_fn=_streamOpenFile) -> StreamHandle:
     ptr = c_void_p()
-    __assertnvperror(_c_fn(filename.encode("ASCII"), ctypes.byref(ptr), probe))
+    _check(_c_fn(filename.encode("ASCII"), ctypes.byref(ptr), probe))
     return ptr
 
 
-@_wrap_function("streamClose", NVP_ErrorCode, [StreamHandle])
-def streamClose(handle: StreamHandle) -> None:
-    __assertnvperror(_c_fn(handle))
+_streamClose = _c_function("streamClose", NVP_ErrorCode, [StreamHandle])
+
 
+def streamClose(handle: StreamHandle, _c_fn=_streamClose) -> None:
+    _check(_c_fn(handle))
 
-@_wrap_function(
+
+_streamReadData = _c_function(
     "streamReadData",
     NVP_ErrorCode,
     [DeviceHandle, POINTER(PacketInfo), POINTER(c_int16), c_int, c_int, POINTER(c_int)],
 )
-def streamReadData(handle: StreamHandle, packet_count: int) -> list[Packet]:
+
+
+def streamReadData(
+    handle: StreamHandle,
+    packet_count: int,
+    legacy: bool = False,
+    _c_fn=_streamReadData,
+) -> tuple[np.ndarray, np.ndarray] | list[Packet]:
+    """Read stream data, returned in the same layout as `readElectrodeData`."""
     # Read stream data
     # StreamHandle: handle of the stream buffer
     # packet_count: number of packets to read
-    # Return: list of "Packet"
+    # legacy: return a list of "Packet" instead of NumPy arrays
+    # Return: (info, data), see _unpack_packets()
 
     channel_count = 64  # Channel count must be 64
-    packets_read = c_int(0)  # Class constructor; packets_read.value = 0
-    info_arr = (
-        PacketInfo * packet_count
-    )()  # Ctypes way of defining an array of packet_count times a PacketInfo element;
-    # (): empty
-    data_arr = (c_int16 * (packet_count * channel_count))()
+    # Buffers are reused between calls, _unpack_packets() copies the data out
+    info_arr, data_arr, packets_read = _packet_buffers(packet_count)
 
     error_code = _c_fn(
         handle,
@@ -842,118 +1163,145 @@ def streamReadData(handle: StreamHandle, packet_count: int) -> list[Packet]:
     if error_code != 26 and error_code != 0:
         raise NeuraviperAPIError(error_code)
 
-    packets = [None] * packets_read.value
-    for i in range(packets_read.value):
-        info = info_arr[i]
-        offset = i * channel_count
-        data = data_arr[offset : offset + channel_count]
-        packets[i] = Packet(
-            info.Timestamp,
-            info.Status,
-            info.payloadlength,
-            info.session_id,
-            data,
-        )
-    return packets
+    return _unpack_packets(info_arr, data_arr, packets_read.value, legacy)
+
+
+_setDeviceEmulatorMode = _c_function(
+    "setDeviceEmulatorMode", NVP_ErrorCode, [DeviceHandle, c_int]
+)
+
+
+def setDeviceEmulatorMode(
+    handle: DeviceHandle, mode: DeviceEmulatorMode, _c_fn=_setDeviceEmulatorMode
+) -> None:
+    _check(_c_fn(handle, mode.value))
 
 
-@_wrap_function("setDeviceEmulatorMode", NVP_ErrorCode, [DeviceHandle, c_int])
-def setDeviceEmulatorMode(handle: DeviceHandle, mode: DeviceEmulatorMode) -> None:
-    __assertnvperror(_c_fn(handle, mode.value))
+_setDeviceEmulatorType = _c_function(
+    "setDeviceEmulatorType", NVP_ErrorCode, [DeviceHandle, c_int]
+)
+
+
+def setDeviceEmulatorType(
+    handle: DeviceHandle, type: DeviceEmulatorType, _c_fn=_setDeviceEmulatorType
+) -> None:
+    _check(_c_fn(handle, type.value))
 
 
-@_wrap_function("setDeviceEmulatorType", NVP_ErrorCode, [DeviceHandle, c_int])
-def setDeviceEmulatorType(handle: DeviceHandle, type: DeviceEmulatorType) -> None:
-    __assertnvperror(_c_fn(handle, type.value))
+_bistBS = _c_function("bistBS", NVP_ErrorCode, [DeviceHandle])
 
 
-@_wrap_function("bistBS", NVP_ErrorCode, [DeviceHandle])
-def bistBS(handle: DeviceHandle):
-    __assertnvperror(_c_fn(handle))
+def bistBS(handle: DeviceHandle, _c_fn=_bistBS):
+    _check(_c_fn(handle))
 
 
-@_wrap_function("bistStartPRBS", NVP_ErrorCode, [DeviceHandle])
-def bistStartPRBS(handle: DeviceHandle):
-    __assertnvperror(_c_fn(handle))
+_bistStartPRBS = _c_function("bistStartPRBS", NVP_ErrorCode, [DeviceHandle])
 
 
-@_wrap_function(
+def bistStartPRBS(handle: DeviceHandle, _c_fn=_bistStartPRBS):
+    _check(_c_fn(handle))
+
+
+_bistStopPRBS = _c_function(
     "bistStopPRBS",
     NVP_ErrorCode,
     [DeviceHandle, POINTER(c_int), POINTER(c_int)],
 )
-def bistStopPRBS(handle: DeviceHandle) -> tuple[int, int]:
+
+
+def bistStopPRBS(handle: DeviceHandle, _c_fn=_bistStopPRBS) -> tuple[int, int]:
     prbs_err_data = c_int(0)
     prbs_err_ctrl = c_int(0)
-    __assertnvperror(_c_fn(handle, prbs_err_data, prbs_err_ctrl))
+    _check(_c_fn(handle, prbs_err_data, prbs_err_ctrl))
     return (prbs_err_data.value, prbs_err_ctrl.value)
 
 
-@_wrap_function(
+_bistReadPRBS = _c_function(
     "bistReadPRBS",
     NVP_ErrorCode,
     [DeviceHandle, POINTER(c_int), POINTER(c_int)],
 )
-def bistReadPRBS(handle: DeviceHandle) -> tuple[int, int]:
+
+
+def bistReadPRBS(handle: DeviceHandle, _c_fn=_bistReadPRBS) -> tuple[int, int]:
     prbs_err_data = c_int(0)
     prbs_err_ctrl = c_int(0)
-    __assertnvperror(_c_fn(handle, prbs_err_data, prbs_err_ctrl))
+    _check(_c_fn(handle, prbs_err_data, prbs_err_ctrl))
     return (prbs_err_data.value, prbs_err_ctrl.value)
 
 
-@_wrap_function("bistEEPROM", NVP_ErrorCode, [DeviceHandle])
-def bistEEPROM(handle: DeviceHandle):
-    __assertnvperror(_c_fn(handle))
+_bistEEPROM = _c_function("bistEEPROM", NVP_ErrorCode, [DeviceHandle])
+
+
+def bistEEPROM(handle: DeviceHandle, _c_fn=_bistEEPROM):
+    _check(_c_fn(handle))
+
 
+_bistSPIMM = _c_function("bistSPIMM", NVP_ErrorCode, [DeviceHandle, c_uint8])
 
-@_wrap_function("bistSPIMM", NVP_ErrorCode, [DeviceHandle, c_uint8])
-def bistSPIMM(handle: DeviceHandle, probe: int):
-    __assertnvperror(_c_fn(handle, probe))
 
+def bistSPIMM(handle: DeviceHandle, probe: int, _c_fn=_bistSPIMM):
+    _check(_c_fn(handle, probe))
 
-@_wrap_function("bistSR", NVP_ErrorCode, [DeviceHandle, c_uint8])
-def bistSR(handle: DeviceHandle, probe: int):
-    __assertnvperror(_c_fn(handle, probe))
+
+_bistSR = _c_function("bistSR", NVP_ErrorCode, [DeviceHandle, c_uint8])
+
+
+def bistSR(handle: DeviceHandle, probe: int, _c_fn=_bistSR):
+    _check(_c_fn(handle, probe))
 
 
 #######################################################################################
 #######################################################################################
 #######################################################################################
-@_wrap_function(
+_selectElectrode = _c_function(
     "selectElectrode",
     NVP_ErrorCode,
     [DeviceHandle, c_uint8, c_int, ElectrodeInput],
 )
+
+
 def selectElectrode(
     handle: DeviceHandle,
     probe: int,
     channel: int,
     electrode: ElectrodeInput,
+    _c_fn=_selectElectrode,
 ) -> None:
-    __assertnvperror(_c_fn(handle, probe, channel, electrode))
+    _check(_c_fn(handle, probe, channel, electrode))
+
+
+_setReference = _c_function(
+    "setReference", NVP_ErrorCode, [DeviceHandle, c_uint8, c_int, c_int]
+)
 
 
-@_wrap_function("setReference", NVP_ErrorCode, [DeviceHandle, c_uint8, c_int, c_int])
 def setReference(
     handle: DeviceHandle,
     probe: int,
     channel: int,
     reference: int,
+    _c_fn=_setReference,
 ) -> None:
-    __assertnvperror(_c_fn(handle, probe, channel, reference))
+    _check(_c_fn(handle, probe, channel, reference))
+
+
+_setOSEnable = _c_function(
+    "setOSEnable", NVP_ErrorCode, [DeviceHandle, c_uint8, c_int, c_bool]
+)
 
 
-@_wrap_function("setOSEnable", NVP_ErrorCode, [DeviceHandle, c_uint8, c_int, c_bool])
 def setOSEnable(
     handle: DeviceHandle,
     probe: int,
     output_stage: int,
     enable: bool,
+    _c_fn=_setOSEnable,
 ) -> None:
-    __assertnvperror(_c_fn(handle, probe, output_stage, enable))
+    _check(_c_fn(handle, probe, output_stage, enable))
 
 
-@_wrap_function(
+_writeSUConfiguration = _c_function(
     "writeSUConfiguration",
     NVP_ErrorCode,
     [
@@ -973,6 +1321,8 @@ def setOSEnable(
         c_uint8,
     ],
 )
+
+
 def writeSUConfiguration(
     handle: DeviceHandle,
     probe: int,
@@ -988,8 +1338,9 @@ def writeSUConfiguration(
     TON2: int,
     TDIS: int,
     TDISEND: int,
+    _c_fn=_writeSUConfiguration,
 ) -> None:
-    __assertnvperror(
+    _check(
         _c_fn(
             handle,
             probe,
@@ -1009,51 +1360,67 @@ def writeSUConfiguration(
     )
 
 
-@_wrap_function("SUtrig1", NVP_ErrorCode, [DeviceHandle, c_uint8, c_uint8])
-def SUtrig1(handle: DeviceHandle, probe: int, trigger: int) -> None:
-    __assertnvperror(_c_fn(handle, probe, trigger))
+_SUtrig1 = _c_function("SUtrig1", NVP_ErrorCode, [DeviceHandle, c_uint8, c_uint8])
 
 
-@_wrap_function(
+def SUtrig1(handle: DeviceHandle, probe: int, trigger: int, _c_fn=_SUtrig1) -> None:
+    _check(_c_fn(handle, probe, trigger))
+
+
+_setOSInputSU = _c_function(
     "setOSInputSU",
     NVP_ErrorCode,
     [DeviceHandle, c_uint8, c_uint8, c_uint8],
 )
+
+
 def setOSInputSU(
     handle: DeviceHandle,
     probe: int,
     output_stage: int,
     stim_unit: int,
+    _c_fn=_setOSInputSU,
 ) -> None:
-    __assertnvperror(_c_fn(handle, probe, output_stage, stim_unit))
+    _check(_c_fn(handle, probe, output_stage, stim_unit))
+
+
+_setAZ = _c_function("setAZ", NVP_ErrorCode, [DeviceHandle, c_uint8, c_uint8, c_bool])
 
 
-@_wrap_function("setAZ", NVP_ErrorCode, [DeviceHandle, c_uint8, c_uint8, c_bool])
-def setAZ(handle: DeviceHandle, probe: int, channel: int, autoreset: bool) -> None:
-    __assertnvperror(_c_fn(handle, probe, channel, autoreset))
+def setAZ(
+    handle: DeviceHandle, probe: int, channel: int, autoreset: bool, _c_fn=_setAZ
+) -> None:
+    _check(_c_fn(handle, probe, channel, autoreset))
 
 
-@_wrap_function(
+_setOSDischargeperm = _c_function(
     "setOSDischargeperm",
     NVP_ErrorCode,
     [DeviceHandle, c_uint8, c_uint8, c_bool],
 )
+
+
 def setOSDischargeperm(
     handle: DeviceHandle,
     probe: int,
     OS: int,
     discharge_perm: bool,
+    _c_fn=_setOSDischargeperm,
 ) -> None:
-    __assertnvperror(_c_fn(handle, probe, OS, discharge_perm))
+    _check(_c_fn(handle, probe, OS, discharge_perm))
 
 
-@_wrap_function(
+_setOSStimblank = _c_function(
     "setOSStimblank",
     NVP_ErrorCode,
     [DeviceHandle, c_uint8, c_uint8, c_bool],
 )
-def setOSStimblank(handle: DeviceHandle, probe: int, OS: int, stimblank: bool) -> None:
-    __assertnvperror(_c_fn(handle, probe, OS, stimblank))
+
+
+def setOSStimblank(
+    handle: DeviceHandle, probe: int, OS: int, stimblank: bool, _c_fn=_setOSStimblank
+) -> None:
+    _check(_c_fn(handle, probe, OS, stimblank))
 
 
 ###############################################################################
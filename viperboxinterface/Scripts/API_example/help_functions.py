@@ -1,53 +1,87 @@
+import json
 import time
+from xml.sax.saxutils import escape
 
 import requests
-from lxml import etree
+from requests.adapters import HTTPAdapter
+
+# Reuse one keep-alive connection to the ViperBox server for all requests
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
 
 
 def _wait_script(start_time: float, initial_time: float):
-    while time.time() - float(initial_time) < float(start_time):
-        time.sleep(0.01)
+    # Sleep once until start_time seconds after initial_time
+    remaining = float(initial_time) + float(start_time) - time.time()
+    if remaining > 0:
+        time.sleep(remaining)
     return True
 
 
-def to_settings_xml_string(settings_input: dict) -> str:
-    program = etree.Element("Program")
-    settings = etree.SubElement(program, "Settings")
-    settings_type = {
-        "Channel": "RecordingSettings",
-        "Configuration": "StimulationWaveformSettings",
-        "Mapping": "StimulationMappingSettings",
-    }
-
-    for sub_type, dct in settings_input.items():
-        recording_settings = etree.SubElement(settings, settings_type[sub_type])
-        _ = etree.SubElement(recording_settings, sub_type, attrib=dct)
-
-    return etree.tostring(program).decode("utf-8")
+# The settings documents have a fixed shape, so they are formatted from templates
+# instead of building and serializing an element tree on every call.
+_SETTINGS_TYPE = {
+    "Channel": "RecordingSettings",
+    "Configuration": "StimulationWaveformSettings",
+    "Mapping": "StimulationMappingSettings",
+}
+# Escape attribute values the same way lxml does
+_ATTRIBUTE_ENTITIES = {'"': "&quot;", "\n": "&#10;", "\r": "&#13;", "\t": "&#9;"}
+_SETTINGS_TEMPLATE = {
+    sub_type: f"<{settings_type}><{sub_type}{{attrs}}/></{settings_type}>"
+    for sub_type, settings_type in _SETTINGS_TYPE.items()
+}
 
 
-def upload_settings(settings, time_init, viperbox_url):
-    _wait_script(settings["start_time"], time_init)
-    xml_string = to_settings_xml_string(
-        settings_input={
-            "Channel": {
-                "box": "1",
-                "probe": "1",
-                "channel": "-",
-                "references": "b",
-                "gain": "0",
-                "input": "0",
-            },
-        },
+def to_settings_xml_string(settings_input: dict) -> str:
+    settings = "".join(
+        _SETTINGS_TEMPLATE[sub_type].format(
+            attrs="".join(
+                f' {key}="{escape(value, _ATTRIBUTE_ENTITIES)}"'
+                for key, value in dct.items()
+            )
+        )
+        for sub_type, dct in settings_input.items()
     )
-    data = {
-        "recording_XML": xml_string,
+    if settings:
+        xml_string = f"<Program><Settings>{settings}</Settings></Program>"
+    else:
+        xml_string = "<Program><Settings/></Program>"
+    # lxml writes ASCII by default, with character references for other characters
+    return xml_string.encode("ascii", "xmlcharrefreplace").decode("ascii")
+
+
+# Request bodies that are the same for every call are encoded to JSON only once
+_JSON_HEADERS = {"Content-Type": "application/json"}
+_RECORDING_SETTINGS_BODY = json.dumps(
+    {
+        "recording_XML": to_settings_xml_string(
+            settings_input={
+                "Channel": {
+                    "box": "1",
+                    "probe": "1",
+                    "channel": "-",
+                    "references": "b",
+                    "gain": "0",
+                    "input": "0",
+                },
+            },
+        ),
         "reset": "False",
         "default_values": "False",
     }
-    _ = requests.post(
+).encode()
+_START_STIMULATION_BODY = json.dumps(
+    {"boxes": "1", "probes": "-", "SU_input": "1"}
+).encode()
+
+
+def upload_settings(settings, time_init, viperbox_url):
+    _wait_script(settings["start_time"], time_init)
+    _ = SESSION.post(
         viperbox_url + "recording_settings",
-        json=data,
+        data=_RECORDING_SETTINGS_BODY,
+        headers=_JSON_HEADERS,
         timeout=5,
     )
 
@@ -82,24 +116,29 @@ def upload_settings(settings, time_init, viperbox_url):
         "reset": "False",
         "default_values": "False",
     }
-    _ = requests.post(
+    _ = SESSION.post(
         viperbox_url + "stimulation_settings",
-        json=data,
+        data=json.dumps(data).encode(),
+        headers=_JSON_HEADERS,
         timeout=5,
     )
 
 
 def start_recording(recording_file_name, viperbox_url, string):
     data = {"recording_name": recording_file_name}
-    _ = requests.post(viperbox_url + "start_recording", json=data, timeout=5)
+    _ = SESSION.post(viperbox_url + "start_recording", json=data, timeout=5)
 
 
 def stimulate(settings, time_init, viperbox_url):
     _wait_script(settings["start_time"], time_init)
-    data = {"boxes": "1", "probes": "-", "SU_input": "1"}
-    _ = requests.post(viperbox_url + "start_stimulation", json=data, timeout=5)
+    _ = SESSION.post(
+        viperbox_url + "start_stimulation",
+        data=_START_STIMULATION_BODY,
+        headers=_JSON_HEADERS,
+        timeout=5,
+    )
 
 
 def stop_recording(settings, time_init, viperbox_url):
     _wait_script(settings["start_time"], time_init)
-    _ = requests.post(viperbox_url + "stop_recording")
+    _ = SESSION.post(viperbox_url + "stop_recording")
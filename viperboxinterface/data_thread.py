@@ -113,17 +113,17 @@ class _DataSenderThread(multiprocessing.Process):
         t0 = self._time()
         while not self.stop_stream.is_set():
             counter += 1
-            packets = NVP.streamReadData(send_data_read_handle, self.NUM_SAMPLES)
-            count = len(packets)
+            info, data = NVP.streamReadData(send_data_read_handle, self.NUM_SAMPLES)
+            count = len(info)
             if count == 0:
                 self.logger.info("No packets read.")
                 break
             if count < self.NUM_SAMPLES:
-                asdf = [packets[i].timestamp for i in range(500)]
-                subtracted = np.asarray([asdf[i + 1] - asdf[i] - 5 for i in range(499)])
-                self.logger.debug(
-                    f" max, min value in time difference{subtracted.max(), subtracted.min()}"
-                )
+                subtracted = np.diff(info["Timestamp"].astype("int64")) - 5
+                if subtracted.size:
+                    self.logger.debug(
+                        f" max, min value in time difference{subtracted.max(), subtracted.min()}"
+                    )
                 self.logger.debug(f"Time difference between packets: {subtracted}")
                 self.logger.info(
                     f"Out of packets; {count} packets read. Sending empty data."
@@ -136,17 +136,10 @@ class _DataSenderThread(multiprocessing.Process):
                 time.sleep(1)
                 counter += 40
                 continue
-            databuffer = np.asarray(
-                [packets[i].data for i in range(self.NUM_SAMPLES)],
-                dtype="uint16",
-            )
-            TTL_bits = np.asarray(
-                [
-                    self._extract_bits(packets[i].status)
-                    for i in range(self.NUM_SAMPLES)
-                ],
-                dtype="uint16",
-            )
+            databuffer = data.astype("uint16")
+            TTL_bits = np.column_stack(
+                self._extract_bits(info["Status"].astype("int64"))
+            ).astype("uint16")
             if counter % 40 == 0:
                 TTL_bits = np.zeros((self.NUM_SAMPLES, 2), dtype="uint16")
             databuffer, self.z = self._prepare_databuffer(databuffer, self.z, TTL_bits)
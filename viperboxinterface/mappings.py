@@ -1,5 +1,9 @@
+import functools
+import hashlib
 import logging
 import logging.handlers
+import os
+import sys
 
 import numpy as np
 import pandas as pd
@@ -12,6 +16,113 @@ socketHandler = logging.handlers.SocketHandler(
 )
 logger.addHandler(socketHandler)
 
+_MAPPING_COLUMNS = [
+    "Probe electrode",
+    "EL_PAD#",
+    "Resulting channel",
+    "Resulting input selection",
+    "Resulting electrode",
+]
+# First line of the CSV export of a mapping file, followed by the digest of the file
+_CSV_DIGEST_PREFIX = "# sha256 of the Excel file: "
+
+
+def _read_excel_sheet(file_path) -> pd.DataFrame:
+    """Read the mapping sheet, using the Rust based calamine engine if available."""
+    try:
+        excel_file = pd.ExcelFile(file_path, engine="calamine")
+    except (ImportError, ValueError):
+        # python-calamine not installed or pandas too old to know the engine,
+        # pandas opens openpyxl workbooks read-only and data-only
+        excel_file = pd.ExcelFile(file_path, engine="openpyxl")
+    with excel_file:
+        return excel_file.parse(sheet_name=1, usecols=_MAPPING_COLUMNS)
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_excel_sheet(file_path: str, digest: str) -> pd.DataFrame:
+    """Parse each mapping file once per content.
+
+    The returned DataFrame is shared between callers and must not be modified.
+    """
+    return _read_excel_sheet(file_path)
+
+
+def _file_digest(file_path) -> str:
+    with open(file_path, "rb") as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
+
+
+def _csv_path(file_path) -> str:
+    return os.path.splitext(file_path)[0] + ".csv"
+
+
+def _read_mapping_sheet(file_path) -> pd.DataFrame:
+    """Read the mapping sheet of an Excel file.
+
+    The CSV export next to the Excel file, written by `_write_mapping_csv`, is read
+    instead when its first line holds the digest of this Excel file. An edited Excel
+    file no longer matches its export, so it is then parsed itself.
+    """
+    file_path = os.path.abspath(file_path)
+    digest = _file_digest(file_path)
+    try:
+        with open(_csv_path(file_path), encoding="utf-8") as csv_file:
+            if csv_file.readline().rstrip("\n") == _CSV_DIGEST_PREFIX + digest:
+                return pd.read_csv(csv_file, usecols=_MAPPING_COLUMNS)
+    except FileNotFoundError:
+        pass
+    # Copy the shared cached frame, so changes by the caller stay local
+    return _cached_excel_sheet(file_path, digest).copy()
+
+
+def _write_mapping_csv(file_path) -> bool:
+    """Export the mapping sheet of an Excel file to a CSV file next to it.
+
+    Returns whether the CSV file was created or changed.
+    """
+    file_path = os.path.abspath(file_path)
+    sheet = _read_excel_sheet(file_path).astype("Int64")
+    content = f"{_CSV_DIGEST_PREFIX}{_file_digest(file_path)}\n" + sheet.to_csv(
+        index=False, lineterminator="\n"
+    )
+    csv_path = _csv_path(file_path)
+    try:
+        with open(csv_path, encoding="utf-8") as csv_file:
+            if csv_file.read() == content:
+                return False
+    except FileNotFoundError:
+        pass
+    with open(csv_path, "w", encoding="utf-8", newline="") as csv_file:
+        csv_file.write(content)
+    return True
+
+
+@functools.lru_cache(maxsize=2)
+def _default_mapping(size: int) -> pd.DataFrame:
+    """Identity mapping used when the mapping file can't be read.
+
+    The returned DataFrame is shared between callers and must not be modified.
+    """
+    return pd.DataFrame(
+        {
+            "Probe electrode": np.arange(size),
+            "EL_PAD#": np.arange(size),
+            "Resulting channel": np.arange(size),
+            "Resulting input selection": np.zeros(size),
+            "Resulting electrode": np.arange(size),
+        },
+        dtype=int,
+    )
+
+
+def _cols_to_dict(df: pd.DataFrame, key_col: str, val_col: str) -> dict:
+    """Map the values of one column to another.
+
+    tolist() gives plain ints, which ctypes accepts as API arguments.
+    """
+    return dict(zip(df[key_col].tolist(), df[val_col].tolist()))
+
 
 class Mappings:
     """Read mappings from Excel file and provide them as properties.
@@ -28,18 +139,8 @@ class Mappings:
         self.get_mappings()
 
     def get_mappings(self):
-        hardcoded_mapping = pd.DataFrame(
-            {
-                "Probe electrode": np.arange(self.output_size),
-                "EL_PAD#": np.arange(self.output_size),
-                "Resulting channel": np.arange(self.output_size),
-                "Resulting input selection": np.zeros(self.output_size),
-                "Resulting electrode": np.arange(self.output_size),
-            },
-            dtype=int,
-        )
         try:
-            self.mapping = pd.read_excel(self.file_path, sheet_name=1)
+            self.mapping = _read_mapping_sheet(self.file_path)
             self.stim_mapping = self.mapping[
                 [
                     "Probe electrode",
@@ -54,33 +155,49 @@ class Mappings:
                 ]
             ].copy()
             self.rec_mapping.dropna(inplace=True)
-            self.rec_mapping = self.rec_mapping.map(int)
-            self.rec_mapping["Resulting channel"] = (
-                self.rec_mapping["Resulting channel"] - 1
-            )
-            self.rec_mapping["Resulting electrode"] = (
-                self.rec_mapping["Resulting electrode"] - 1
-            )
+            self.rec_mapping = self.rec_mapping.astype("int64")
+            self.rec_mapping[["Resulting channel", "Resulting electrode"]] -= 1
 
             logger.info("Mappings read from excel file")
         except Exception as e:
+            hardcoded_mapping = _default_mapping(self.output_size)
             self.rec_mapping = hardcoded_mapping.copy()
+            self.stim_mapping = hardcoded_mapping[["Probe electrode", "EL_PAD#"]].copy()
             logger.warning(
-                f"Couldn't read mappings from excel file, using defaults. Error: {e}",
+                "Couldn't read mappings from excel file, using defaults. Error: %s",
+                e,
             )
 
+        # The properties below are looked up often, so build their dicts once.
+        self._channel_input = _cols_to_dict(
+            self.rec_mapping, "Resulting channel", "Resulting input selection"
+        )
+        self._electrode_mapping = _cols_to_dict(
+            self.rec_mapping, "Resulting channel", "Resulting electrode"
+        )
+        self._probe_to_os_map = _cols_to_dict(
+            self.stim_mapping, "Probe electrode", "EL_PAD#"
+        )
+
     @property
     def channel_input(self):
-        return self.rec_mapping.set_index("Resulting channel")[
-            "Resulting input selection"
-        ].to_dict()
+        return self._channel_input
 
     @property
     def electrode_mapping(self):
-        return self.rec_mapping.set_index("Resulting channel")[
-            "Resulting electrode"
-        ].to_dict()
+        return self._electrode_mapping
 
     @property
     def probe_to_os_map(self):
-        return self.stim_mapping.set_index("Probe electrode")["EL_PAD#"].to_dict()
+        return self._probe_to_os_map
+
+
+if __name__ == "__main__":
+    # Update the CSV export of the default mapping, exits with 1 when it changed so
+    # the pre-commit hook fails on an outdated export
+    default_mapping_file = os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "defaults",
+        "electrode_mapping_short_cables.xlsx",
+    )
+    sys.exit(_write_mapping_csv(default_mapping_file))